@@ -8,6 +8,7 @@ Usage:
     python baseline_evaluation.py --model-size 1.5B --mode zero-shot
     python baseline_evaluation.py --model-size all --mode few-shot
     python baseline_evaluation.py --model-size 7B --mode both
+    python baseline_evaluation.py --model-size 7B --mode both --backend vllm
 
 Model sizes available:
     - 0.5B:  Qwen/Qwen2.5-Coder-0.5B (fast, low memory)
@@ -16,21 +17,46 @@ Model sizes available:
     - 7B:    Qwen/Qwen2.5-Coder-7B (high quality, requires 16GB+ VRAM)
     - 14B:   Qwen/Qwen2.5-Coder-14B (very high quality, requires 32GB+ VRAM)
     - 32B:   Qwen/Qwen2.5-Coder-32B (best quality, requires 80GB+ VRAM)
+    - 14B-awq: Qwen/Qwen2.5-Coder-14B-Instruct-AWQ (4-bit weights, requires 12GB+ VRAM)
+    - 32B-awq: Qwen/Qwen2.5-Coder-32B-Instruct-AWQ (4-bit weights, requires 24GB+ VRAM)
+
+The -awq entries are the 4-bit AWQ checkpoints Qwen publishes; they are
+instruction-tuned rather than base models, so "--model-size all" skips them.
+Loading them with the HF backend requires `pip install autoawq`.
 """
 
 import argparse
+import gc
 import json
 import time
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, StoppingCriteria, StoppingCriteriaList
+from transformers.utils import is_auto_awq_available
 
 # Import test dataset and verification utilities
 from test_dataset import build_test_dataset, build_few_shot_examples
 from verus_verification import verify_with_verus, compute_verification_metrics
 
+# Optional: vLLM for batched offline inference (PagedAttention + continuous batching)
+try:
+    from vllm import LLM, SamplingParams
+    from vllm.distributed.parallel_state import destroy_distributed_environment, destroy_model_parallel
+except ImportError:
+    LLM = None  # If vllm is not installed, only the HuggingFace backend is available
+    SamplingParams = None
+    destroy_distributed_environment = None
+    destroy_model_parallel = None
+
+# Optional: py-cpuinfo for detecting CPUs with native bf16 support
+try:
+    import cpuinfo
+except ImportError:
+    cpuinfo = None
+
 
 # Available Qwen2.5-Coder model sizes
 QWEN_MODELS = {
@@ -42,16 +68,94 @@ QWEN_MODELS = {
     "32B": "Qwen/Qwen2.5-Coder-32B",
 }
 
-# Note: build_test_dataset() and build_few_shot_examples() are imported from test_dataset.py
+# 4-bit quantized variants (~4x less weight memory and bandwidth). These are
+# Instruct checkpoints, so they are kept out of the base-model "all" sweep
+QWEN_AWQ_MODELS = {
+    "14B-awq": "Qwen/Qwen2.5-Coder-14B-Instruct-AWQ",
+    "32B-awq": "Qwen/Qwen2.5-Coder-32B-Instruct-AWQ",
+}
+
+# Prompt token budget shared by both backends; longer prompts keep only their
+# last tokens. The vLLM context (max_model_len) is this plus the 512 new tokens.
+MAX_PROMPT_TOKENS = 1536
+
+# Temperatures at or below this decode greedily: sampling that close to argmax adds
+# per-token top-p overhead and makes runs non-reproducible for little diversity
+GREEDY_TEMPERATURE_THRESHOLD = 0.1
+
+# Note: build_test_dataset() and build_few_shot_examples() are imported from test_dataset.py.
+# Both are constant, so build them once at import instead of per model in the "all" sweep
+_TEST_EXAMPLES = build_test_dataset()
+_FEW_SHOT_PREFIX = build_few_shot_examples()
+
+
+def select_torch_dtype() -> torch.dtype:
+    """
+    Pick the fastest safe dtype for the available hardware.
+
+    bf16 is only fast on Ampere+ GPUs and on CPUs with AVX512-BF16/AMX; elsewhere
+    it is emulated and can be an order of magnitude slower than fp16/fp32.
+
+    Returns:
+        bfloat16 on Ampere+ GPUs, float16 on older GPUs, and bfloat16 or float32
+        on CPU depending on ISA support
+    """
+    if torch.cuda.is_available():
+        cc_major = torch.cuda.get_device_capability(0)[0]
+        return torch.bfloat16 if cc_major >= 8 else torch.float16
+
+    if cpuinfo is not None:
+        flags = cpuinfo.get_cpu_info().get("flags", [])
+        if "avx512_bf16" in flags or "amx_bf16" in flags:
+            return torch.bfloat16
+    return torch.float32
+
+
+def get_quantization_method(model_name: str) -> Optional[str]:
+    """
+    Detect a pre-quantized checkpoint from its model identifier suffix.
+
+    Args:
+        model_name: HuggingFace model identifier
+
+    Returns:
+        "awq", "gptq", or None for unquantized checkpoints
+    """
+    upper_name = model_name.upper()
+    if upper_name.endswith("-AWQ"):
+        return "awq"
+    if upper_name.endswith("-GPTQ"):
+        return "gptq"
+    return None
+
+
+def can_compile_model(model_name: str) -> bool:
+    """
+    Whether load_model compiles the forward pass of a model by default.
+
+    Older torch releases have known inference regressions with inductor, so
+    compilation requires CUDA and torch 2.5.1+. Pre-quantized AWQ/GPTQ
+    checkpoints are excluded: their GEMM kernels are extension calls Dynamo
+    cannot trace, so CUDA graphs and freezing would break at every linear.
+
+    Args:
+        model_name: HuggingFace model identifier
+    """
+    return (
+        torch.cuda.is_available()
+        and torch.__version__ >= "2.5.1"
+        and get_quantization_method(model_name) is None
+    )
 
 
-def load_model(model_name: str, device: str = "auto"):
+def load_model(model_name: str, device: str = "auto", compile_model: bool = True):
     """
     Load a Qwen model and tokenizer.
 
     Args:
         model_name: HuggingFace model identifier
         device: Device to load model on ('auto', 'cuda', 'cpu')
+        compile_model: Compile the forward pass with torch.compile (CUDA only)
 
     Returns:
         Tuple of (model, tokenizer)
@@ -61,65 +165,299 @@ def load_model(model_name: str, device: str = "auto"):
 
     tokenizer = AutoTokenizer.from_pretrained(model_name)
 
-    # Load model with appropriate settings
+    # Left-pad so every row of a batched generate() ends at the same position
+    tokenizer.padding_side = "left"
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+
+    # Load model with appropriate settings. AWQ/GPTQ kernels compute in fp16;
+    # transformers picks the quantized kernels from the checkpoint config
+    quantization = get_quantization_method(model_name)
+    if quantization == "awq" and not is_auto_awq_available():
+        raise ImportError(
+            f"{model_name} is an AWQ checkpoint. Install autoawq (`pip install autoawq`) or use --backend vllm."
+        )
     model = AutoModelForCausalLM.from_pretrained(
         model_name,
-        torch_dtype=torch.bfloat16 if torch.cuda.is_available() else torch.float32,
+        torch_dtype=torch.float16 if quantization else select_torch_dtype(),
         device_map=device,
     )
 
+    # CUDA graphs from "reduce-overhead" remove per-token Python dispatch; they
+    # rely on the static KV cache used in generate_completions. Compilation
+    # happens lazily on the first call for each shape; see warmup_compiled_model
+    if compile_model and torch.cuda.is_available():
+        if can_compile_model(model_name):
+            # Fold the (frozen) inference weights into the compiled graph. The
+            # inductor config is process-global, so this stays on for any later
+            # torch.compile in this process; it is set here rather than via
+            # TORCHINDUCTOR_FREEZING so it is only enabled when the HF path
+            # compiles and is not inherited by vLLM worker subprocesses
+            import torch._inductor.config
+            torch._inductor.config.freezing = True
+            model.forward = torch.compile(model.forward, mode="reduce-overhead", fullgraph=False, dynamic=True)
+        elif quantization:
+            print(f"Skipping torch.compile: {quantization.upper()} kernels are not traceable")
+        else:
+            print(f"Skipping torch.compile: torch {torch.__version__} < 2.5.1")
+
     print(f"Model loaded successfully on {model.device}")
     return model, tokenizer
 
 
-def generate_completion(
+def load_vllm_model(model_name: str):
+    """
+    Load a Qwen model into a vLLM offline inference engine.
+
+    Args:
+        model_name: HuggingFace model identifier
+
+    Returns:
+        A ``vllm.LLM`` instance
+    """
+    if LLM is None:
+        raise ImportError("vLLM is not installed. Install it with `pip install vllm` or use --backend hf.")
+
+    print(f"Loading model with vLLM: {model_name}")
+    print(f"This may take several minutes depending on model size...")
+
+    quantization = get_quantization_method(model_name)
+    quantization_kwargs = {}
+    if quantization:
+        quantization_kwargs["quantization"] = quantization
+        # Ada/Hopper (compute capability 8.9+) support an fp8 KV cache, halving
+        # its footprint for the large quantized models
+        if torch.cuda.is_available() and torch.cuda.get_device_capability(0) >= (8, 9):
+            quantization_kwargs["kv_cache_dtype"] = "fp8"
+
+    # Prefix caching lets every few-shot prompt reuse the KV blocks of the
+    # shared few-shot prefix, so it is prefilled once per batch instead of
+    # once per example
+    llm = LLM(
+        model=model_name,
+        dtype=torch.float16 if quantization else select_torch_dtype(),
+        gpu_memory_utilization=0.9,
+        max_model_len=MAX_PROMPT_TOKENS + 512,
+        enable_prefix_caching=True,
+        **quantization_kwargs,
+    )
+
+    print("Model loaded successfully")
+    return llm
+
+
+def generate_completions_vllm(
+    llm,
+    prompts: List[str],
+    max_new_tokens: int = 512,
+    temperature: float = 0.2,
+    top_p: float = 0.95,
+    max_prompt_tokens: int = MAX_PROMPT_TOKENS,
+) -> List[Tuple[str, float]]:
+    """
+    Generate completions for all prompts in a single batched vLLM call.
+
+    Args:
+        llm: The vLLM engine
+        prompts: Input prompts
+        max_new_tokens: Maximum tokens to generate
+        temperature: Sampling temperature (greedy decoding at or below GREEDY_TEMPERATURE_THRESHOLD)
+        top_p: Nucleus sampling parameter
+        max_prompt_tokens: Prompts longer than this keep only their last tokens
+
+    Returns:
+        List of (generated text, amortized generation time in seconds), in prompt order
+    """
+    if temperature <= GREEDY_TEMPERATURE_THRESHOLD:
+        sampling_params = SamplingParams(temperature=0.0, max_tokens=max_new_tokens)
+    else:
+        sampling_params = SamplingParams(
+            temperature=temperature,
+            top_p=top_p,
+            max_tokens=max_new_tokens,
+        )
+
+    # Truncate from the left, as the HF backend does, so over-long prompts fit
+    # max_model_len instead of being rejected by the engine
+    tokenizer = llm.get_tokenizer()
+    token_prompts = [
+        {"prompt_token_ids": tokenizer(prompt).input_ids[-max_prompt_tokens:]}
+        for prompt in prompts
+    ]
+
+    start_time = time.time()
+    outputs = llm.generate(token_prompts, sampling_params)
+    # Every request is submitted with the batch, so per-request latencies are all
+    # close to the batch time; report the amortized time like the HF backend
+    gen_time = (time.time() - start_time) / len(prompts)
+
+    return [(output.outputs[0].text.strip(), gen_time) for output in outputs]
+
+
+# Prompt token ids keyed by (tokenizer name_or_path, text, add_special_tokens),
+# kept in least-recently-used order and bounded like functools.lru_cache. This
+# dedupes the zero-shot/few-shot modes and repeated runs of the same model.
+# Only ids are stored, never tokenizers.
+_PROMPT_IDS_CACHE: "OrderedDict[Tuple[str, str, bool], Tuple[int, ...]]" = OrderedDict()
+_PROMPT_IDS_CACHE_SIZE = 256
+
+
+def tokenize_prompt(tokenizer, text: str, add_special_tokens: bool = False) -> Tuple[int, ...]:
+    """
+    Tokenize a prompt, memoized per tokenizer across modes and runs.
+
+    Args:
+        tokenizer: The tokenizer
+        text: Text to tokenize
+        add_special_tokens: Whether the tokenizer should add special tokens
+
+    Returns:
+        Token ids of the text
+    """
+    key = (tokenizer.name_or_path, text, add_special_tokens)
+    if key in _PROMPT_IDS_CACHE:
+        _PROMPT_IDS_CACHE.move_to_end(key)
+        return _PROMPT_IDS_CACHE[key]
+
+    ids = tuple(tokenizer(text, add_special_tokens=add_special_tokens).input_ids)
+    _PROMPT_IDS_CACHE[key] = ids
+    if len(_PROMPT_IDS_CACHE) > _PROMPT_IDS_CACHE_SIZE:
+        _PROMPT_IDS_CACHE.popitem(last=False)
+    return ids
+
+
+def generate_completions(
     model,
     tokenizer,
-    prompt: str,
+    prompt_ids: List[List[int]],
     max_new_tokens: int = 512,
     temperature: float = 0.2,
     top_p: float = 0.95,
-) -> str:
+    max_prompt_tokens: int = MAX_PROMPT_TOKENS,
+) -> List[str]:
     """
-    Generate a completion for the given prompt.
+    Generate completions for a batch of already tokenized prompts in one call.
 
     Args:
         model: The language model
-        tokenizer: The tokenizer
-        prompt: Input prompt
+        tokenizer: The tokenizer (must be configured for left padding)
+        prompt_ids: Token ids of each prompt
         max_new_tokens: Maximum tokens to generate
-        temperature: Sampling temperature (lower = more deterministic)
+        temperature: Sampling temperature (greedy decoding at or below GREEDY_TEMPERATURE_THRESHOLD)
         top_p: Nucleus sampling parameter
+        max_prompt_tokens: Prompts longer than this keep only their last tokens
 
     Returns:
-        Generated text completion
+        Generated text completions, in prompt order
     """
-    inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+    # Truncate from the left so the task itself is never cut off
+    truncated = [ids[-max_prompt_tokens:] for ids in prompt_ids]
+    inputs = tokenizer.pad({"input_ids": truncated}, return_tensors="pt").to(model.device)
 
-    num_input_tokens = inputs['input_ids'].shape[1]
-    
+    # With left padding every prompt ends at the same column
+    num_input_tokens = inputs["input_ids"].shape[1]
+
+    # Greedy decoding skips the temperature/top-p warpers on every step
+    use_sample = temperature > GREEDY_TEMPERATURE_THRESHOLD
+    sampling_kwargs = {"temperature": temperature, "top_p": top_p} if use_sample else {}
+
+    # A static KV cache is allocated once at prompt + max_new_tokens, avoiding
+    # the grow-and-concatenate reallocations of the default dynamic cache
     with torch.no_grad():
         outputs = model.generate(
             **inputs,
             max_new_tokens=max_new_tokens,
-            temperature=temperature,
-            top_p=top_p,
-            do_sample=True,
-            pad_token_id=tokenizer.eos_token_id,
+            do_sample=use_sample,
+            **sampling_kwargs,
+            pad_token_id=tokenizer.pad_token_id,
+            cache_implementation="static",
         )
 
     # Extract only the newly generated tokens using token indices, then decode
     # This avoids issues with tokenizer whitespace normalization and encoding differences
-    generated_tokens = outputs[0][num_input_tokens:]
-    generated_text = tokenizer.decode(generated_tokens, skip_special_tokens=True)
+    generated_tokens = outputs[:, num_input_tokens:]
+    generated_texts = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+
+    return [text.strip() for text in generated_texts]
+
+
+class _StopAfterTokens(StoppingCriteria):
+    """Stop generation once every sequence has reached a fixed length."""
+
+    def __init__(self, max_length: int):
+        self.max_length = max_length
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        done = input_ids.shape[1] >= self.max_length
+        return torch.full((input_ids.shape[0],), done, dtype=torch.bool, device=input_ids.device)
+
+
+def warmup_compiled_model(
+    model,
+    tokenizer,
+    prompt_ids: List[List[int]],
+    max_new_tokens: int = 512,
+    warmup_steps: int = 3,
+    max_prompt_tokens: int = MAX_PROMPT_TOKENS,
+):
+    """
+    Trigger compilation and CUDA-graph recording for a batch before it is timed.
+
+    The warmup uses the same padded batch and ``max_new_tokens`` as the real
+    call, so the prefill and decode shapes and the static cache length match,
+    but stops after a few decode steps instead of generating the full output.
+
+    Args:
+        model: The compiled language model
+        tokenizer: The tokenizer (must be configured for left padding)
+        prompt_ids: Token ids of each prompt, exactly as passed to generate_completions
+        max_new_tokens: Must equal the value used for the timed call
+        warmup_steps: Decode steps to run; reduce-overhead records graphs after a few calls
+        max_prompt_tokens: Must equal the value used for the timed call
+    """
+    truncated = [ids[-max_prompt_tokens:] for ids in prompt_ids]
+    inputs = tokenizer.pad({"input_ids": truncated}, return_tensors="pt").to(model.device)
+    stop = _StopAfterTokens(inputs["input_ids"].shape[1] + warmup_steps)
+
+    with torch.no_grad():
+        model.generate(
+            **inputs,
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            pad_token_id=tokenizer.pad_token_id,
+            cache_implementation="static",
+            stopping_criteria=StoppingCriteriaList([stop]),
+        )
 
-    return generated_text.strip()
+
+def free_gpu_memory():
+    """
+    Reclaim memory of models that are no longer referenced.
+
+    Without this, a dropped model's VRAM is only released whenever Python's
+    garbage collector runs, which can be after the next model fails to load.
+    """
+    # vLLM keeps its engine (weights and KV cache) reachable from its
+    # distributed state; both calls are no-ops when vLLM was not used
+    if destroy_model_parallel is not None:
+        destroy_model_parallel()
+        destroy_distributed_environment()
+    # Compiled graphs are cached on the shared modeling code, not on the model;
+    # with inductor freezing they hold the weights as constants, and the
+    # reduce-overhead CUDA-graph pools stay allocated until dynamo is reset
+    torch._dynamo.reset()
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+        torch.cuda.ipc_collect()
 
 
 def evaluate_model(
     model_size: str,
     mode: str = "zero-shot",
     output_dir: str = "./baseline_results",
+    backend: str = "hf",
+    temperature: float = 0.2,
 ):
     """
     Evaluate a Qwen model on the Verus test set.
@@ -128,15 +466,24 @@ def evaluate_model(
         model_size: Size of the model to evaluate (e.g., "1.5B", "7B")
         mode: Evaluation mode ("zero-shot", "few-shot", or "both")
         output_dir: Directory to save results
+        backend: Inference backend ("hf" for transformers, "vllm" for batched vLLM)
+        temperature: Sampling temperature (greedy decoding at or below GREEDY_TEMPERATURE_THRESHOLD)
     """
-    if model_size not in QWEN_MODELS:
-        raise ValueError(f"Invalid model size: {model_size}. Choose from {list(QWEN_MODELS.keys())}")
+    available_models = {**QWEN_MODELS, **QWEN_AWQ_MODELS}
+    if model_size not in available_models:
+        raise ValueError(f"Invalid model size: {model_size}. Choose from {list(available_models.keys())}")
 
-    model_name = QWEN_MODELS[model_size]
-    test_examples = build_test_dataset()
+    model_name = available_models[model_size]
+    test_examples = _TEST_EXAMPLES
 
     # Load model
-    model, tokenizer = load_model(model_name)
+    if backend == "vllm":
+        llm = load_vllm_model(model_name)
+    else:
+        model, tokenizer = load_model(model_name)
+        # Tokenize each test prompt once; the ids are reused by every mode and,
+        # through the tokenize_prompt cache, by repeated runs of the same model
+        example_ids = [tokenize_prompt(tokenizer, example["prompt"]) for example in test_examples]
 
     # Determine which modes to run
     modes_to_run = []
@@ -153,18 +500,33 @@ def evaluate_model(
         print(f"{'='*60}\n")
 
         results = []
-        few_shot_prefix = build_few_shot_examples() if eval_mode == "few-shot" else ""
+        few_shot_prefix = _FEW_SHOT_PREFIX if eval_mode == "few-shot" else ""
 
-        for i, example in enumerate(test_examples):
-            print(f"Example {i+1}/{len(test_examples)}: {example['task_type']}")
+        prompts = [few_shot_prefix + example["prompt"] for example in test_examples]
+
+        # Generate all completions of this mode in one batched call
+        if backend == "vllm":
+            print(f"Generating {len(prompts)} completions with vLLM...")
+            completions = generate_completions_vllm(llm, prompts, temperature=temperature)
+        else:
+            # The few-shot prefix is tokenized once per mode and prepended to each example
+            prefix_ids = tokenize_prompt(tokenizer, few_shot_prefix, add_special_tokens=True) if few_shot_prefix else ()
+            prompt_ids = [list(prefix_ids + ids) for ids in example_ids]
 
-            # Construct full prompt
-            full_prompt = few_shot_prefix + example["prompt"]
+            # Compile for this batch's shapes outside the timed region
+            if can_compile_model(model_name):
+                print("Warming up compiled model for this batch...")
+                warmup_compiled_model(model, tokenizer, prompt_ids)
 
-            # Generate completion
+            print(f"Generating {len(prompt_ids)} completions in one batch...")
             start_time = time.time()
-            generated = generate_completion(model, tokenizer, full_prompt)
-            gen_time = time.time() - start_time
+            generated_texts = generate_completions(model, tokenizer, prompt_ids, temperature=temperature)
+            # All rows finish together, so report the amortized per-example time
+            gen_time = (time.time() - start_time) / len(prompt_ids)
+            completions = [(generated, gen_time) for generated in generated_texts]
+
+        for i, (example, (generated, gen_time)) in enumerate(zip(test_examples, completions)):
+            print(f"Example {i+1}/{len(test_examples)}: {example['task_type']}")
 
             #Verify with Verus
             print(f"  Generated in {gen_time:.2f}s, verifying with Verus...", end=" ")
@@ -193,6 +555,13 @@ def evaluate_model(
 
         all_results[eval_mode] = results
 
+    # Generation is done; release the model before saving and summarizing
+    if backend == "vllm":
+        del llm
+    else:
+        del model, tokenizer
+    free_gpu_memory()
+
     # Save results
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -242,7 +611,10 @@ def main():
         "--model-size",
         type=str,
         default="1.5B",
-        help=f"Model size to evaluate. Options: {', '.join(QWEN_MODELS.keys())}, or 'all'",
+        help=(
+            f"Model size to evaluate. Options: {', '.join([*QWEN_MODELS, *QWEN_AWQ_MODELS])}, "
+            "or 'all' (base models only)"
+        ),
     )
     parser.add_argument(
         "--mode",
@@ -257,6 +629,19 @@ def main():
         default="./baseline_results",
         help="Directory to save evaluation results",
     )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default="hf",
+        choices=["hf", "vllm"],
+        help="Inference backend: hf (transformers) or vllm",
+    )
+    parser.add_argument(
+        "--temperature",
+        type=float,
+        default=0.2,
+        help=f"Sampling temperature; <= {GREEDY_TEMPERATURE_THRESHOLD} uses greedy decoding for reproducible runs",
+    )
 
     args = parser.parse_args()
 
@@ -265,12 +650,15 @@ def main():
         print("Evaluating all model sizes. This will take a long time!")
         for size in QWEN_MODELS.keys():
             try:
-                evaluate_model(size, args.mode, args.output_dir)
+                evaluate_model(size, args.mode, args.output_dir, args.backend, args.temperature)
             except Exception as e:
                 print(f"Error evaluating {size}: {e}")
                 print("Continuing with next model size...")
+            finally:
+                # Also covers failed runs, whose model is only freed with the traceback
+                free_gpu_memory()
     else:
-        evaluate_model(args.model_size, args.mode, args.output_dir)
+        evaluate_model(args.model_size, args.mode, args.output_dir, args.backend, args.temperature)
 
 
 if __name__ == "__main__":
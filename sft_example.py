@@ -14,6 +14,8 @@ instruction→completion task).  The key steps are:
     a code-specialized model, but you can substitute any causal language model
     compatible with Hugging Face transformers.  If you wish to use LoRA for
     parameter-efficient fine‑tuning, you can provide a `LoraConfig` (see below).
+    With LoRA on a GPU and bitsandbytes installed, the frozen base weights are
+    loaded in 4-bit NF4 (QLoRA) so the 7B model fits on a 16GB card.
 
 3.  Construct an `SFTTrainer` with appropriate training arguments.  You can
     configure batch size, number of epochs, sequence length, learning rate,
@@ -27,15 +29,21 @@ instruction→completion task).  The key steps are:
     adapter for inference.
 """
 
+import hashlib
+import os
+
+import torch
 from datasets import Dataset
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
+from transformers.utils import is_bitsandbytes_available, is_flash_attn_2_available
 from trl import SFTTrainer, SFTConfig
 
 # Optional: LoRA configuration for parameter‑efficient fine‑tuning
 try:
-    from peft import LoraConfig
+    from peft import LoraConfig, prepare_model_for_kbit_training
 except ImportError:
     LoraConfig = None  # If peft is not installed, set this to None
+    prepare_model_for_kbit_training = None
 
 
 def build_dataset() -> Dataset:
@@ -51,39 +59,21 @@ def build_dataset() -> Dataset:
     Returns:
         A Hugging Face ``Dataset`` containing the 10 training examples.
     """
-    examples = [
-        {
-            "text": "Add Verus specs to this function:\n```rust\nfn abs(x: i32) -> i32 {\n    if x < 0 { -x } else { x }\n}\n```\n```verus\nfn abs(x: i32) -> i32 {\n    requires true;\n    ensures |result| == |x| && (result == x || result == -x);\n    if x < 0 { -x } else { x }\n}\n```",
-        },
-        {
-            "text": "Generate Rust code that satisfies: requires x > 0, ensures return == x + 1.\nfn add_one(x: i32) -> i32 {\n    requires x > 0;\n    ensures result == x + 1;\n    x + 1\n}",
-        },
-        {
-            "text": "Add Verus specs to this max function:\n```rust\nfn max(a: i32, b: i32) -> i32 {\n    if a > b { a } else { b }\n}\n```\n```verus\nfn max(a: i32, b: i32) -> i32 {\n    ensures result >= a && result >= b;\n    ensures result == a || result == b;\n    if a > b { a } else { b }\n}\n```",
-        },
-        {
-            "text": "Write a Verus function that doubles a number:\n```verus\nfn double(x: i32) -> i32 {\n    requires x < i32::MAX / 2;\n    ensures result == 2 * x;\n    x * 2\n}\n```",
-        },
-        {
-            "text": "Add Verus specification for array bounds checking:\n```rust\nfn get_first(arr: &[i32]) -> Option<i32> {\n    if arr.len() > 0 {\n        Some(arr[0])\n    } else {\n        None\n    }\n}\n```\n```verus\nfn get_first(arr: &[i32]) -> Option<i32> {\n    requires true;\n    ensures arr.len() > 0 ==> result == Some(arr[0]);\n    ensures arr.len() == 0 ==> result == None;\n    if arr.len() > 0 {\n        Some(arr[0])\n    } else {\n        None\n    }\n}\n```",
-        },
-        {
-            "text": "Create a Verus function for subtraction:\n```verus\nfn subtract(a: i32, b: i32) -> i32 {\n    requires a >= b;\n    ensures result == a - b;\n    ensures result >= 0;\n    a - b\n}\n```",
-        },
-        {
-            "text": "Add Verus specs for division:\n```rust\nfn divide(a: u32, b: u32) -> u32 {\n    a / b\n}\n```\n```verus\nfn divide(a: u32, b: u32) -> u32 {\n    requires b > 0;\n    ensures result == a / b;\n    ensures result <= a;\n    a / b\n}\n```",
-        },
-        {
-            "text": "Write a Verus function that checks if a number is positive:\n```verus\nfn is_positive(x: i32) -> bool {\n    ensures result == (x > 0);\n    x > 0\n}\n```",
-        },
-        {
-            "text": "Add Verus specs for minimum function:\n```rust\nfn min(a: i32, b: i32) -> i32 {\n    if a < b { a } else { b }\n}\n```\n```verus\nfn min(a: i32, b: i32) -> i32 {\n    ensures result <= a && result <= b;\n    ensures result == a || result == b;\n    if a < b { a } else { b }\n}\n```",
-        },
-        {
-            "text": "Create a Verus function for squaring:\n```verus\nfn square(x: i32) -> i32 {\n    requires x.abs() < 46341;  // sqrt(i32::MAX)\n    ensures result == x * x;\n    ensures result >= 0;\n    x * x\n}\n```",
-        },
+    texts = [
+        "Add Verus specs to this function:\n```rust\nfn abs(x: i32) -> i32 {\n    if x < 0 { -x } else { x }\n}\n```\n```verus\nfn abs(x: i32) -> i32 {\n    requires true;\n    ensures |result| == |x| && (result == x || result == -x);\n    if x < 0 { -x } else { x }\n}\n```",
+        "Generate Rust code that satisfies: requires x > 0, ensures return == x + 1.\nfn add_one(x: i32) -> i32 {\n    requires x > 0;\n    ensures result == x + 1;\n    x + 1\n}",
+        "Add Verus specs to this max function:\n```rust\nfn max(a: i32, b: i32) -> i32 {\n    if a > b { a } else { b }\n}\n```\n```verus\nfn max(a: i32, b: i32) -> i32 {\n    ensures result >= a && result >= b;\n    ensures result == a || result == b;\n    if a > b { a } else { b }\n}\n```",
+        "Write a Verus function that doubles a number:\n```verus\nfn double(x: i32) -> i32 {\n    requires x < i32::MAX / 2;\n    ensures result == 2 * x;\n    x * 2\n}\n```",
+        "Add Verus specification for array bounds checking:\n```rust\nfn get_first(arr: &[i32]) -> Option<i32> {\n    if arr.len() > 0 {\n        Some(arr[0])\n    } else {\n        None\n    }\n}\n```\n```verus\nfn get_first(arr: &[i32]) -> Option<i32> {\n    requires true;\n    ensures arr.len() > 0 ==> result == Some(arr[0]);\n    ensures arr.len() == 0 ==> result == None;\n    if arr.len() > 0 {\n        Some(arr[0])\n    } else {\n        None\n    }\n}\n```",
+        "Create a Verus function for subtraction:\n```verus\nfn subtract(a: i32, b: i32) -> i32 {\n    requires a >= b;\n    ensures result == a - b;\n    ensures result >= 0;\n    a - b\n}\n```",
+        "Add Verus specs for division:\n```rust\nfn divide(a: u32, b: u32) -> u32 {\n    a / b\n}\n```\n```verus\nfn divide(a: u32, b: u32) -> u32 {\n    requires b > 0;\n    ensures result == a / b;\n    ensures result <= a;\n    a / b\n}\n```",
+        "Write a Verus function that checks if a number is positive:\n```verus\nfn is_positive(x: i32) -> bool {\n    ensures result == (x > 0);\n    x > 0\n}\n```",
+        "Add Verus specs for minimum function:\n```rust\nfn min(a: i32, b: i32) -> i32 {\n    if a < b { a } else { b }\n}\n```\n```verus\nfn min(a: i32, b: i32) -> i32 {\n    ensures result <= a && result <= b;\n    ensures result == a || result == b;\n    if a < b { a } else { b }\n}\n```",
+        "Create a Verus function for squaring:\n```verus\nfn square(x: i32) -> i32 {\n    requires x.abs() < 46341;  // sqrt(i32::MAX)\n    ensures result == x * x;\n    ensures result >= 0;\n    x * x\n}\n```",
     ]
-    return Dataset.from_list(examples)
+    # from_dict builds the Arrow column in one shot; from_list would infer the
+    # schema row by row, which gets slow when this is scaled to real datasets
+    return Dataset.from_dict({"text": texts})
 
 
 def main():
@@ -102,14 +92,48 @@ def main():
 
     # Load tokenizer and model.  Use ``tokenizer`` to map strings to token
     # sequences and ``model`` to initialize the pre‑trained weights.
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    # ``use_fast=True`` selects the Rust tokenizer implementation.
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
 
     # Set pad token if not already set (Qwen models typically have this configured)
     if tokenizer.pad_token is None:
         tokenizer.pad_token = tokenizer.eos_token
 
-    model = AutoModelForCausalLM.from_pretrained(model_name)
+    # Train in bf16 on GPUs that support it.  FlashAttention-2 avoids
+    # materializing the full attention matrix; without the flash-attn package
+    # (or without a bf16 GPU) fall back to PyTorch SDPA.
+    use_bf16 = torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+    attn_implementation = "flash_attention_2" if use_bf16 and is_flash_attn_2_available() else "sdpa"
+
+    # QLoRA: when only LoRA adapters are trained, the frozen base weights can be
+    # stored in 4-bit NF4 while the adapters and matmul accumulation stay in
+    # 16-bit.  Requires peft, bitsandbytes and a CUDA GPU.
+    use_qlora = LoraConfig is not None and torch.cuda.is_available() and is_bitsandbytes_available()
+    quantization_kwargs = {}
+    if use_qlora:
+        quantization_kwargs = {
+            "quantization_config": BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=torch.bfloat16 if use_bf16 else torch.float16,
+                bnb_4bit_use_double_quant=True,  # Also quantize the quantization constants
+            ),
+            "device_map": "auto",
+        }
+
+    model = AutoModelForCausalLM.from_pretrained(
+        model_name,
+        torch_dtype=torch.bfloat16 if use_bf16 else torch.float32,
+        attn_implementation=attn_implementation,
+        use_cache=False,  # The KV cache is unused in training and conflicts with gradient checkpointing
+        **quantization_kwargs,
+    )
     model.config.pad_token_id = tokenizer.pad_token_id
+    if use_qlora:
+        # Upcasts norms/embeddings for stable training on top of 4-bit weights
+        model = prepare_model_for_kbit_training(
+            model, gradient_checkpointing_kwargs={"use_reentrant": False}
+        )
 
     # Define training configuration.  Adjust hyperparameters according to your
     # compute resources.  ``max_seq_length`` should be large enough to fit
@@ -121,11 +145,22 @@ def main():
         per_device_train_batch_size=2,  # Increased batch size
         num_train_epochs=10,  # More epochs for better learning
         max_seq_length=1024,
+        # The examples are ~150 tokens; packing concatenates them (EOS-separated)
+        # into full 1024-token sequences instead of padding each one.  The
+        # dataset is pre-tokenized below, so packing works on its input_ids.
+        packing=True,
         learning_rate=3e-4,  # Slightly higher learning rate
         gradient_accumulation_steps=2,
         logging_steps=5,  # Log every 5 steps
         save_strategy="epoch",  # Save checkpoint each epoch
         save_total_limit=2,  # Keep only 2 best checkpoints
+        dataset_num_proc=os.cpu_count(),  # Tokenize the dataset across all CPU cores
+        bf16=use_bf16,
+        # Recompute activations in the backward pass: ~30% more compute for
+        # several times less activation memory, leaving room for larger batches
+        gradient_checkpointing=True,
+        gradient_checkpointing_kwargs={"use_reentrant": False},
+        optim="adamw_torch_fused" if torch.cuda.is_available() else "adamw_torch",  # Fused CUDA AdamW step
     )
 
     # Optionally configure LoRA for parameter‑efficient fine‑tuning.  If you
@@ -148,9 +183,33 @@ def main():
             task_type="CAUSAL_LM",
         )
 
-    # Initialize the SFTTrainer.  ``train_dataset`` must be a Hugging Face
-    # ``Dataset`` with a "text" field containing the training examples.
-    # The trainer will tokenize these fields for training.
+    # Tokenize once and cache the result on disk so repeated runs (epoch or
+    # hyperparameter sweeps) load the Arrow table instead of re-tokenizing.
+    # The cache file name includes a hash of the model and texts so a changed
+    # dataset never reuses stale token ids.  EOS is appended to every example
+    # so packed examples stay separated.
+    cache_key = hashlib.sha256(
+        "\n".join([model_name, str(config.max_seq_length), *train_dataset["text"]]).encode("utf-8")
+    ).hexdigest()[:16]
+
+    def tokenize(batch):
+        return tokenizer(
+            [text + tokenizer.eos_token for text in batch["text"]],
+            truncation=True,
+            max_length=config.max_seq_length,
+        )
+
+    train_dataset = train_dataset.map(
+        tokenize,
+        batched=True,
+        num_proc=config.dataset_num_proc,
+        cache_file_name=f"./sft_tokenized_{cache_key}.arrow",
+        remove_columns=["text"],
+    )
+
+    # Initialize the SFTTrainer.  ``train_dataset`` is the pre-tokenized
+    # Hugging Face ``Dataset`` (an "input_ids" column), so the trainer skips
+    # its own tokenization and only packs the examples.
     trainer = SFTTrainer(
         model=model,
         train_dataset=train_dataset,
@@ -6,11 +6,14 @@ traceable; adapt the functions to your environment and toolchain paths.
 from __future__ import annotations
 
 import json
+import os
 import re
 import shutil
 import subprocess
 import tempfile
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional
@@ -31,6 +34,31 @@ VERUS_TOKENS = {
     "opens_invariants",
 }
 
+# Files scoring below this are almost always incidental matches (e.g. a lone
+# "spec" in a comment) and are not worth a verifier run
+MIN_VERUS_SCORE = 2
+
+# Top-level `use` paths, compiled once rather than on every call
+_USE_RE = re.compile(r"^use\s+([\w:]+)", re.MULTILINE)
+
+
+# Identical for every temp crate, so encode it once
+_CARGO_TOML = "\n".join(
+    [
+        "[package]",
+        "name = \"verus_extract\"",
+        "version = \"0.1.0\"",
+        "edition = \"2021\"",
+        "",
+        "[dependencies]",
+        "verus = \"*\"",
+    ]
+).encode("utf-8")
+
+# Build temp crates on RAM-backed tmpfs when available (Linux) so parallel
+# workers do not contend on disk I/O; None falls back to the default temp dir
+_TEMP_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
 
 @dataclass
 class ExtractionResult:
@@ -56,10 +84,21 @@ class ExtractionResult:
 def find_rust_files(repo_root: Path) -> List[Path]:
     ignore_dirs = {"target", "tests", "examples", "benches", "docs", "vendor", ".git"}
     rust_files = []
-    for path in repo_root.rglob("*.rs"):
-        if any(part in ignore_dirs for part in path.parts):
+    # Iterative walk with os.scandir so ignored directories are pruned whole
+    # instead of being descended into and filtered per file
+    stack = [str(repo_root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in ignore_dirs:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".rs"):
+                        rust_files.append(Path(entry.path))
+        except OSError:
             continue
-        rust_files.append(path)
     return rust_files
 
 
@@ -76,15 +115,11 @@ def load_file(path: Path) -> str:
 
 
 def extract_local_dependencies(text: str) -> List[str]:
-    pattern = re.compile(r"^use\s+([\w:]+)", re.MULTILINE)
-    deps = []
-    for match in pattern.finditer(text):
-        deps.append(match.group(1))
-    return deps
+    return _USE_RE.findall(text)
 
 
 def build_temp_crate(snippet: str) -> Path:
-    temp_dir = Path(tempfile.mkdtemp(prefix="verus_extract_"))
+    temp_dir = Path(tempfile.mkdtemp(prefix="verus_extract_", dir=_TEMP_ROOT))
     src_dir = temp_dir / "src"
     src_dir.mkdir(parents=True, exist_ok=True)
 
@@ -94,20 +129,7 @@ def build_temp_crate(snippet: str) -> Path:
     lib_rs.write_text(snippet, encoding="utf-8")
 
     cargo_toml = temp_dir / "Cargo.toml"
-    cargo_toml.write_text(
-        "\n".join(
-            [
-                "[package]",
-                "name = \"verus_extract\"",
-                "version = \"0.1.0\"",
-                "edition = \"2021\"",
-                "",
-                "[dependencies]",
-                "verus = \"*\"",
-            ]
-        ),
-        encoding="utf-8",
-    )
+    cargo_toml.write_bytes(_CARGO_TOML)
     return temp_dir
 
 
@@ -122,6 +144,15 @@ def attempt_extract(path: Path) -> ExtractionResult:
         return ExtractionResult(path, "skipped", "no_verus_tokens", code=text)
 
     score = score_verus_tokens(text)
+
+    # Cheap filters before paying for a temp crate and a verifier process
+    if score < MIN_VERUS_SCORE:
+        return ExtractionResult(path, "skipped", f"low_score={score}", code=text)
+    # build_temp_crate wraps bare snippets in verus! {}, so a spec clause alone is
+    # enough structure to be worth verifying
+    if not any(marker in text for marker in ("verus!", "#[verus::", "requires", "ensures")):
+        return ExtractionResult(path, "skipped", f"no_verus_block score={score}", code=text)
+
     deps = extract_local_dependencies(text)
 
     temp_crate = build_temp_crate(text)
@@ -153,23 +184,42 @@ def attempt_extract(path: Path) -> ExtractionResult:
         shutil.rmtree(temp_crate, ignore_errors=True)
 
 
-def main(repo: Path, out_dir: Path, limit: Optional[int] = None) -> None:
+def default_workers() -> int:
+    # Verus runs Z3 with its own worker threads, so leave half the cores to it
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def main(repo: Path, out_dir: Path, limit: Optional[int] = None, workers: Optional[int] = None) -> None:
     rust_files = find_rust_files(repo)
     rust_files.sort()
-    results: List[ExtractionResult] = []
-
-    for idx, path in enumerate(rust_files):
-        if limit is not None and idx >= limit:
-            break
-        result = attempt_extract(path)
-        results.append(result)
-        print(result.to_json())
+    if limit is not None:
+        rust_files = rust_files[:limit]
 
+    # Stream each result to the manifest as soon as it is produced so memory
+    # does not grow with the total size of the scanned sources
     out_dir.mkdir(parents=True, exist_ok=True)
     manifest = out_dir / "manifest.jsonl"
-    with manifest.open("w", encoding="utf-8") as f:
-        for item in results:
-            f.write(item.to_json() + "\n")
+    workers = workers or default_workers()
+    # Each file is verified in its own temp crate, so files are independent.
+    # Only a bounded window of files is in flight and results are written in
+    # input order, so at most max_in_flight results (with their code) are held
+    # while the oldest one waits on the verifier.
+    max_in_flight = 4 * workers
+    with manifest.open("w", encoding="utf-8") as f, ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        def write_oldest() -> None:
+            line = pending.popleft().result().to_json()
+            f.write(line + "\n")
+            f.flush()
+            print(line)
+
+        for path in rust_files:
+            pending.append(executor.submit(attempt_extract, path))
+            if len(pending) >= max_in_flight:
+                write_oldest()
+        while pending:
+            write_oldest()
 
 
 if __name__ == "__main__":
@@ -179,6 +229,7 @@ if __name__ == "__main__":
     parser.add_argument("--repo", type=Path, default=Path.cwd(), help="Path to the repository root")
     parser.add_argument("--out", type=Path, default=Path("./extracted_snippets"), help="Output directory for manifest")
     parser.add_argument("--limit", type=int, default=None, help="Optional limit on number of files to process")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel verification processes (default: half the CPU cores)")
     args = parser.parse_args()
 
-    main(args.repo, args.out, args.limit)
+    main(args.repo, args.out, args.limit, args.workers)